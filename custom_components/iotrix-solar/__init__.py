@@ -1,18 +1,36 @@
 """Iotrix Solar integration - main entry point."""
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.update_coordinator import (
-    DataUpdateCoordinator,
-    UpdateFailed,
-)
-import asyncio
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import Event, HomeAssistant
 
-from .const import DOMAIN, PLATFORMS, CONF_UPDATE_INTERVAL
-from .api import (
-    IotrixSolarApiClient,
-    IotrixSolarApiError,
-    IotrixSolarAuthError,
+from .const import (
+    DOMAIN,
+    PLATFORMS,
+    CONF_API_URL,
+    CONF_DEVICE_ID,
+    CONF_TOKEN,
+    CONF_COOKIE,
+    CONF_UPDATE_INTERVAL,
+    CONF_QRCODE_API_URL,
+    CONF_QRCODE_STATUS_API_URL,
+    CONF_TOKEN_API_URL,
+    CONF_EXPORT_MODE,
+    CONF_EXPORT_URL,
+    CONF_EXPORT_TOKEN,
+    CONF_EXPORT_BATCH_SIZE,
+    CONF_EXPORT_FLUSH_INTERVAL,
+    CONF_EXPORT_RETENTION_DAYS,
+    EXPORT_MODE_DISABLED,
+    DEFAULT_EXPORT_MODE,
+    DEFAULT_EXPORT_URL,
+    DEFAULT_EXPORT_BATCH_SIZE,
+    DEFAULT_EXPORT_FLUSH_INTERVAL,
+    DEFAULT_EXPORT_RETENTION_DAYS,
 )
+from .api import IotrixSolarApiClient
+from .coordinator import IotrixSolarDataUpdateCoordinator
+from .exporter import IotrixSolarExporter
+from .services import async_setup_services, async_unload_services
 
 # 初始化集成（由HA自动调用）
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
@@ -30,30 +48,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         token_api_url=entry.data.get(CONF_TOKEN_API_URL),
     )
 
-    # 定义数据更新方法（核心：定期获取设备数据）
-    async def async_update_data():
-        """Fetch new data from Iotrix API."""
-        try:
-            return await client.async_get_device_data()
-        except IotrixSolarAuthError as e:
-            # Token/Cookie失效，标记状态并抛出异常
-            return {
-                "pv_power": 0.0,
-                "daily_generation": 0.0,
-                "total_generation": 0.0,
-                "battery_soc": 0.0,
-                "token_status": "expired",
-            }
-        except IotrixSolarApiError as e:
-            raise UpdateFailed(f"Failed to fetch data: {str(e)}") from e
-
     # 初始化数据协调器（定期更新数据）
-    coordinator = DataUpdateCoordinator(
-        hass,
-        hass.logger.getChild(DOMAIN),
-        name=f"Iotrix Solar ({entry.data['device_id']})",
-        update_method=async_update_data,
-        update_interval=asyncio.timedelta(seconds=entry.data[CONF_UPDATE_INTERVAL]),
+    coordinator = IotrixSolarDataUpdateCoordinator(
+        hass, client, update_interval=entry.data[CONF_UPDATE_INTERVAL]
     )
 
     # 首次刷新数据
@@ -65,9 +62,37 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "coordinator": coordinator,
     }
 
+    # 可选：遥测批量导出（文件/InfluxDB），不经过recorder
+    export_mode = entry.options.get(CONF_EXPORT_MODE, DEFAULT_EXPORT_MODE)
+    if export_mode != EXPORT_MODE_DISABLED:
+        exporter = IotrixSolarExporter(
+            hass,
+            coordinator,
+            device_id=client.device_id,
+            mode=export_mode,
+            url=entry.options.get(CONF_EXPORT_URL, DEFAULT_EXPORT_URL),
+            token=entry.options.get(CONF_EXPORT_TOKEN),
+            batch_size=entry.options.get(CONF_EXPORT_BATCH_SIZE, DEFAULT_EXPORT_BATCH_SIZE),
+            flush_interval=entry.options.get(CONF_EXPORT_FLUSH_INTERVAL, DEFAULT_EXPORT_FLUSH_INTERVAL),
+            retention_days=entry.options.get(CONF_EXPORT_RETENTION_DAYS, DEFAULT_EXPORT_RETENTION_DAYS),
+        )
+        exporter.async_start()
+        hass.data[DOMAIN][entry.entry_id]["exporter"] = exporter
+
+        # HA停止时不会卸载配置条目，需在停止事件中写出剩余缓冲
+        async def async_flush_on_stop(_event: Event) -> None:
+            await exporter.async_stop()
+
+        entry.async_on_unload(
+            hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, async_flush_on_stop)
+        )
+
     # 加载传感器和摄像头平台
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    # 注册手动刷新服务（所有配置条目共用）
+    await async_setup_services(hass)
+
     # 监听配置更新（如用户修改参数后重新加载）
     entry.async_on_unload(entry.add_update_listener(async_update_options))
 
@@ -81,8 +106,14 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         # 关闭API会话
         client = hass.data[DOMAIN][entry.entry_id]["client"]
         await client.async_close()
+        # 写出剩余的遥测缓冲
+        exporter = hass.data[DOMAIN][entry.entry_id].get("exporter")
+        if exporter:
+            await exporter.async_stop()
         # 移除上下文数据
         hass.data[DOMAIN].pop(entry.entry_id)
+        # 最后一个条目卸载时移除服务
+        await async_unload_services(hass)
     return unload_ok
 
 async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
@@ -1,5 +1,6 @@
 """Iotrix Solar API Client - handles WeChat QR login and data fetching."""
 import asyncio
+import json
 import aiohttp
 from typing import Dict, Any, Optional
 from homeassistant.core import HomeAssistant
@@ -11,6 +12,7 @@ from .const import (
     QRCODE_STATUS_EXPIRED,
 )
 from .helpers import base64_to_bytes
+from .profiler import profiled
 
 # 异常定义
 class IotrixSolarApiError(Exception):
@@ -195,8 +197,16 @@ class IotrixSolarApiClient:
         # Timeout
         raise IotrixSolarQrcodeError(f"QR code login timeout (>{timeout}s)")
 
+    @profiled
     async def async_get_device_data(self) -> Dict[str, Any]:
         """Fetch solar device data from Iotrix API (core business logic)."""
+        # 网络等待与解析分开计时，便于性能分析定位耗时
+        body = await self._async_fetch_device_data()
+        return self._parse_device_data(body)
+
+    @profiled
+    async def _async_fetch_device_data(self) -> str:
+        """Request device data and return the raw response body."""
         session = await self.async_get_session()
         headers = await self.async_get_headers()
         # 设备数据API地址（根据抓包结果调整，如/api/v1/device/data）
@@ -212,19 +222,27 @@ class IotrixSolarApiClient:
                 if response.status != 200:
                     raise IotrixSolarApiError(f"Data fetch failed (status: {response.status})")
 
-                # Parse data (根据抓包的响应字段调整)
-                raw_data = await response.json()
-                data = raw_data.get("data", {})
-                return {
-                    "pv_power": float(data.get("pvPower", 0.0)),
-                    "daily_generation": float(data.get("dailyGen", 0.0)),
-                    "total_generation": float(data.get("totalGen", 0.0)),
-                    "battery_soc": float(data.get("batterySoc", 0.0)),
-                    "token_status": "valid" if not response.status in (401, 403) else "invalid",
-                }
+                return await response.text()
         except aiohttp.ClientError as e:
             raise IotrixSolarApiError(f"Network error: {str(e)}") from e
 
+    @profiled
+    def _parse_device_data(self, body: str) -> Dict[str, Any]:
+        """Parse the device data response body (根据抓包的响应字段调整)."""
+        try:
+            raw_data = json.loads(body)
+            data = raw_data.get("data", {})
+            return {
+                "pv_power": float(data.get("pvPower", 0.0)),
+                "daily_generation": float(data.get("dailyGen", 0.0)),
+                "total_generation": float(data.get("totalGen", 0.0)),
+                "battery_soc": float(data.get("batterySoc", 0.0)),
+                # 401/403已在请求阶段抛出IotrixSolarAuthError
+                "token_status": "valid",
+            }
+        except (ValueError, TypeError, AttributeError) as e:
+            raise IotrixSolarApiError(f"Invalid device data: {str(e)}") from e
+
     async def async_close(self) -> None:
         """Close the aiohttp session to free resources."""
         if self._session and not self._session.closed:
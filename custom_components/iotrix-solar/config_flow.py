@@ -1,7 +1,7 @@
 """Config flow for Iotrix Solar integration - supports QR login and manual auth."""
 import voluptuous as vol
 from homeassistant import config_entries
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
@@ -22,6 +22,19 @@ from .const import (
     DEFAULT_QRCODE_API_URL,
     DEFAULT_QRCODE_STATUS_API_URL,
     DEFAULT_TOKEN_API_URL,
+    CONF_EXPORT_MODE,
+    CONF_EXPORT_URL,
+    CONF_EXPORT_BATCH_SIZE,
+    CONF_EXPORT_FLUSH_INTERVAL,
+    CONF_EXPORT_TOKEN,
+    CONF_EXPORT_RETENTION_DAYS,
+    EXPORT_MODES,
+    DEFAULT_EXPORT_MODE,
+    DEFAULT_EXPORT_URL,
+    DEFAULT_EXPORT_BATCH_SIZE,
+    DEFAULT_EXPORT_FLUSH_INTERVAL,
+    DEFAULT_EXPORT_RETENTION_DAYS,
+    EXPORT_DIR,
 )
 from .api import (
     IotrixSolarApiClient,
@@ -57,6 +70,12 @@ class IotrixSolarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
     _temp_data: Dict[str, Any] = {}  # 存储临时配置数据
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: config_entries.ConfigEntry) -> config_entries.OptionsFlow:
+        """Return the options flow (telemetry export settings)."""
+        return IotrixSolarOptionsFlow(config_entry)
+
     async def async_step_user(self, user_input: dict | None = None) -> FlowResult:
         """Initial step: select login mode (QR code / manual auth)."""
         errors = {}
@@ -195,4 +214,48 @@ class IotrixSolarConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=data_schema,
             errors=errors,
             description="Enter Token or Cookie (either one) for Iotrix Solar authentication",
+        )
+
+class IotrixSolarOptionsFlow(config_entries.OptionsFlow):
+    """Handle options for Iotrix Solar (telemetry export)."""
+
+    def __init__(self, config_entry: config_entries.ConfigEntry) -> None:
+        """Initialize the options flow."""
+        self._entry = config_entry
+
+    async def async_step_init(self, user_input: dict | None = None) -> FlowResult:
+        """Configure the batched telemetry exporter."""
+        if user_input is not None:
+            # 保存后由update listener重新加载集成
+            return self.async_create_entry(title="", data=user_input)
+
+        options = self._entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Required(
+                    CONF_EXPORT_MODE, default=options.get(CONF_EXPORT_MODE, DEFAULT_EXPORT_MODE)
+                ): vol.In(EXPORT_MODES),
+                vol.Optional(
+                    CONF_EXPORT_URL, default=options.get(CONF_EXPORT_URL, DEFAULT_EXPORT_URL)
+                ): str,
+                vol.Optional(
+                    CONF_EXPORT_TOKEN, default=options.get(CONF_EXPORT_TOKEN, "")
+                ): str,
+                vol.Optional(
+                    CONF_EXPORT_BATCH_SIZE, default=options.get(CONF_EXPORT_BATCH_SIZE, DEFAULT_EXPORT_BATCH_SIZE)
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=5000)),
+                vol.Optional(
+                    CONF_EXPORT_FLUSH_INTERVAL, default=options.get(CONF_EXPORT_FLUSH_INTERVAL, DEFAULT_EXPORT_FLUSH_INTERVAL)
+                ): vol.All(vol.Coerce(int), vol.Range(min=10, max=3600)),
+                vol.Optional(
+                    CONF_EXPORT_RETENTION_DAYS, default=options.get(CONF_EXPORT_RETENTION_DAYS, DEFAULT_EXPORT_RETENTION_DAYS)
+                ): vol.All(vol.Coerce(int), vol.Range(min=1, max=365)),
+            }
+        )
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=data_schema,
+            # 说明文字见strings.json的options.step.init
+            description_placeholders={"export_dir": EXPORT_DIR},
         )
\ No newline at end of file
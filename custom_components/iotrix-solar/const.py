@@ -27,6 +27,40 @@ DEFAULT_QRCODE_API_URL = "https://portal.iotrix.net/api/v1/qrcode/generate"
 DEFAULT_QRCODE_STATUS_API_URL = "https://portal.iotrix.net/api/v1/qrcode/status"
 DEFAULT_TOKEN_API_URL = "https://portal.iotrix.net/api/v1/token/refresh"
 
+# 手动刷新服务
+SERVICE_REFRESH = "refresh"
+ATTR_ENTRY_ID = "entry_id"
+ATTR_IOTRIX_DEVICE_ID = "iotrix_device_id"  # 避免与HA保留的device_id目标字段冲突
+REFRESH_COOLDOWN = 5  # 冷却窗口内的重复调用直接复用上次结果（秒）
+REFRESH_MAX_CONCURRENCY = 5  # 批量刷新时的最大并发设备数
+
+# 性能分析服务
+SERVICE_PROFILE = "profile"
+ATTR_DURATION = "duration"
+DEFAULT_PROFILE_DURATION = 30  # 分析时长（秒）
+PROFILE_MAX_DURATION = 120  # cProfile会分析整个事件循环，限制时长
+
+# 遥测导出（可选，绕过recorder直接批量写出）
+CONF_EXPORT_MODE = "export_mode"
+CONF_EXPORT_URL = "export_url"
+CONF_EXPORT_BATCH_SIZE = "export_batch_size"
+CONF_EXPORT_FLUSH_INTERVAL = "export_flush_interval"
+CONF_EXPORT_TOKEN = "export_token"  # InfluxDB API Token（可选）
+CONF_EXPORT_RETENTION_DAYS = "export_retention_days"
+EXPORT_MODE_DISABLED = "disabled"
+EXPORT_MODE_FILE = "file"  # 按天轮转的gzip压缩CSV
+EXPORT_MODE_INFLUXDB = "influxdb"  # InfluxDB line protocol
+EXPORT_MODES = [EXPORT_MODE_DISABLED, EXPORT_MODE_FILE, EXPORT_MODE_INFLUXDB]
+DEFAULT_EXPORT_MODE = EXPORT_MODE_DISABLED
+# InfluxDB 1.x /write接口；2.x也提供该兼容接口（需配合Token）
+DEFAULT_EXPORT_URL = "http://localhost:8086/write?db=iotrix_solar&precision=ns"
+DEFAULT_EXPORT_BATCH_SIZE = 100  # 缓冲达到该条数立即写出
+DEFAULT_EXPORT_FLUSH_INTERVAL = 300  # 定时写出间隔（秒）
+DEFAULT_EXPORT_RETENTION_DAYS = 7  # 导出文件保留天数
+EXPORT_RETRY_MAX_BACKOFF = 3600  # 写出失败后的最大重试间隔（秒）
+EXPORT_MAX_BUFFER = 10000  # 内存缓冲上限，超出时丢弃最旧数据
+EXPORT_DIR = "iotrix_solar_export"  # 相对于HA配置目录
+
 # 扫码状态常量
 QRCODE_STATUS_UNSCANNED = "unscanned"
 QRCODE_STATUS_SCANNED = "scanned"
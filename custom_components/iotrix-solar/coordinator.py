@@ -0,0 +1,80 @@
+"""Data update coordinator for Iotrix Solar - periodic device data refresh."""
+import asyncio
+import logging
+from datetime import timedelta
+from typing import Any, Dict, Optional, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.update_coordinator import (
+    DataUpdateCoordinator,
+    UpdateFailed,
+)
+
+from .api import (
+    IotrixSolarApiClient,
+    IotrixSolarApiError,
+    IotrixSolarAuthError,
+)
+from .profiler import profiled
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IotrixSolarDataUpdateCoordinator(DataUpdateCoordinator):
+    """Coordinator that merges overlapping refreshes into one per device."""
+
+    def __init__(self, hass: HomeAssistant, client: IotrixSolarApiClient, update_interval: int):
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=f"Iotrix Solar ({client.device_id})",
+            update_interval=timedelta(seconds=update_interval),
+        )
+        self.client = client
+        # 正在进行的数据拉取：定时刷新与手动刷新服务重叠时共用同一次请求
+        self._fetch_task: Optional[asyncio.Task] = None
+        # 上次通知监听器时的(数据, 成功标志)，同一次拉取结果只分发一次
+        self._published: Optional[Tuple[Any, bool]] = None
+
+    @profiled
+    async def _async_update_data(self) -> Dict[str, Any]:
+        """Fetch new data, joining a fetch that is already in flight."""
+        if self._fetch_task is None or self._fetch_task.done():
+            self._fetch_task = self.hass.async_create_task(self._async_fetch_data())
+        return await asyncio.shield(self._fetch_task)
+
+    async def _async_fetch_data(self) -> Dict[str, Any]:
+        """Fetch new data from Iotrix API."""
+        try:
+            return await self.client.async_get_device_data()
+        except IotrixSolarAuthError:
+            # Token/Cookie失效，标记状态（数值为占位，不代表真实读数）
+            return {
+                "pv_power": 0.0,
+                "daily_generation": 0.0,
+                "total_generation": 0.0,
+                "battery_soc": 0.0,
+                "token_status": "expired",
+            }
+        except IotrixSolarApiError as e:
+            raise UpdateFailed(f"Failed to fetch data: {str(e)}") from e
+
+    @callback
+    @profiled
+    def async_update_listeners(self) -> None:
+        """Notify listeners, skipping a repeat of the same fetch result.
+
+        Two refreshes that joined one fetch end with the identical data
+        object; only the first one writes entity states. Timed as the
+        listener fan-out while profiling.
+        """
+        published = (self.data, self.last_update_success)
+        if (
+            self._published is not None
+            and published[0] is self._published[0]
+            and published[1] == self._published[1]
+        ):
+            return
+        self._published = published
+        super().async_update_listeners()
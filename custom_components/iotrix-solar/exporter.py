@@ -0,0 +1,251 @@
+"""Telemetry exporter for Iotrix Solar - batches snapshots to files or InfluxDB."""
+import asyncio
+import csv
+import gzip
+import io
+import logging
+import os
+from collections import deque
+from contextlib import suppress
+from datetime import datetime, timedelta
+from itertools import groupby
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+import aiohttp
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    EXPORT_MODE_FILE,
+    EXPORT_MODE_INFLUXDB,
+    EXPORT_MAX_BUFFER,
+    EXPORT_RETRY_MAX_BACKOFF,
+    EXPORT_DIR,
+    SENSOR_TYPES,
+)
+from .helpers import slugify
+from .profiler import profiled
+
+_LOGGER = logging.getLogger(__name__)
+
+# 单条样本：(UTC时间, 设备快照)
+Sample = Tuple[datetime, Dict[str, Any]]
+
+
+def _escape_tag(value: str) -> str:
+    """Escape an InfluxDB tag key/value (commas, spaces, equals signs)."""
+    return value.replace("\\", "\\\\").replace(",", "\\,").replace(" ", "\\ ").replace("=", "\\=")
+
+
+def to_line_protocol(device_id: str, samples: List[Sample]) -> str:
+    """Render samples as InfluxDB line protocol (nanosecond timestamps)."""
+    tags = f"iotrix_solar,device_id={_escape_tag(device_id)}"
+    lines = []
+    for timestamp, data in samples:
+        fields = []
+        for key in SENSOR_TYPES:
+            value = data.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                fields.append(f"{key}={float(value)}")
+            elif isinstance(value, str):
+                escaped = value.replace("\\", "\\\\").replace('"', '\\"')
+                fields.append(f'{key}="{escaped}"')
+        if fields:
+            # 整数运算，避免经float换算到纳秒时的精度损失
+            timestamp_ns = int(timestamp.timestamp()) * 1_000_000_000 + timestamp.microsecond * 1000
+            lines.append(f"{tags} {','.join(fields)} {timestamp_ns}")
+    return "\n".join(lines)
+
+
+def to_csv(samples: List[Sample], header: bool) -> bytes:
+    """Render samples as CSV rows (optionally with a header row)."""
+    output = io.StringIO()
+    writer = csv.writer(output)
+    if header:
+        writer.writerow(["timestamp", *SENSOR_TYPES])
+    for timestamp, data in samples:
+        writer.writerow([timestamp.isoformat(), *(data.get(key) for key in SENSOR_TYPES)])
+    return output.getvalue().encode("utf-8")
+
+
+class IotrixSolarExporter:
+    """Buffer coordinator snapshots in memory and flush them in batches."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        coordinator: DataUpdateCoordinator,
+        device_id: str,
+        mode: str,
+        url: Optional[str],
+        token: Optional[str],
+        batch_size: int,
+        flush_interval: int,
+        retention_days: int,
+    ):
+        self.hass = hass
+        self.coordinator = coordinator
+        self.device_id = device_id
+        self.mode = mode
+        self.url = url
+        self.token = token
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retention_days = retention_days
+        # deque的maxlen保证内存有界：写出跟不上时自动丢弃最旧样本
+        self._buffer: Deque[Sample] = deque(maxlen=EXPORT_MAX_BUFFER)
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._unsub_listener = None
+        self._unsub_timer = None
+        # 写出失败后的退避：在retry_at之前不再触发写出
+        self._backoff = 0
+        self._retry_at = 0.0
+        self.dropped = 0
+
+    def async_start(self) -> None:
+        """Attach to the coordinator and start the periodic flush timer."""
+        self._unsub_listener = self.coordinator.async_add_listener(self._async_handle_update)
+        self._unsub_timer = async_track_time_interval(
+            self.hass, self._async_handle_timer, timedelta(seconds=self.flush_interval)
+        )
+
+    async def async_stop(self) -> None:
+        """Detach from the coordinator and flush what is left in the buffer.
+
+        Called on entry unload and on Home Assistant stop; safe to call twice.
+        """
+        if self._unsub_listener:
+            self._unsub_listener()
+            self._unsub_listener = None
+        if self._unsub_timer:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._flush_task and not self._flush_task.done():
+            # 被取消的批次会放回缓冲区，由下面的最终写出处理
+            self._flush_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._flush_task
+        self._flush_task = None
+
+        await self.async_flush(force=True)
+        if self._buffer:
+            _LOGGER.error(
+                "Telemetry export for %s failed on stop, %d samples lost",
+                self.device_id, len(self._buffer),
+            )
+            self._buffer.clear()
+
+    @callback
+    def _async_handle_update(self) -> None:
+        """Buffer the latest snapshot after each successful refresh."""
+        if not self.coordinator.last_update_success or not self.coordinator.data:
+            return
+        # Token失效时协调器返回的是占位数据，不是真实读数
+        if self.coordinator.data.get("token_status") != "valid":
+            return
+        if len(self._buffer) == self._buffer.maxlen:
+            self.dropped += 1
+        self._buffer.append((dt_util.utcnow(), dict(self.coordinator.data)))
+        if (
+            len(self._buffer) >= self.batch_size
+            and not self._flush_lock.locked()
+            and (self._flush_task is None or self._flush_task.done())
+            and self.hass.loop.time() >= self._retry_at
+        ):
+            self._flush_task = self.hass.async_create_task(self.async_flush())
+
+    async def _async_handle_timer(self, _now: datetime) -> None:
+        """Flush on the time-based trigger."""
+        await self.async_flush()
+
+    @profiled
+    async def async_flush(self, force: bool = False) -> None:
+        """Write buffered samples in batches of at most `batch_size`.
+
+        A failed batch is re-queued and further flushes are suppressed with
+        exponential backoff; `force` ignores the backoff (used on unload).
+        """
+        async with self._flush_lock:
+            if not force and self.hass.loop.time() < self._retry_at:
+                return
+            while self._buffer:
+                batch = [self._buffer.popleft() for _ in range(min(self.batch_size, len(self._buffer)))]
+                try:
+                    if self.mode == EXPORT_MODE_INFLUXDB:
+                        await self._async_write_influxdb(batch)
+                    elif self.mode == EXPORT_MODE_FILE:
+                        await self.hass.async_add_executor_job(self._write_file, batch)
+                except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+                    self._requeue(batch)
+                    self._backoff = min(
+                        max(self._backoff * 2, self.flush_interval), EXPORT_RETRY_MAX_BACKOFF
+                    )
+                    self._retry_at = self.hass.loop.time() + self._backoff
+                    _LOGGER.warning(
+                        "Telemetry export failed for %s, keeping %d samples, retrying in %ds: %s",
+                        self.device_id, len(self._buffer), self._backoff, str(e),
+                    )
+                    break
+                except asyncio.CancelledError:
+                    self._requeue(batch)
+                    raise
+                self._backoff = 0
+                self._retry_at = 0.0
+            if self.dropped:
+                _LOGGER.warning(
+                    "Telemetry buffer full for %s, dropped %d oldest samples",
+                    self.device_id, self.dropped,
+                )
+                self.dropped = 0
+
+    def _requeue(self, batch: List[Sample]) -> None:
+        """Put an unwritten batch back at the head of the buffer."""
+        # 超出上限时仍然丢弃最旧的样本
+        pending = batch + list(self._buffer)
+        self.dropped += max(0, len(pending) - EXPORT_MAX_BUFFER)
+        self._buffer = deque(pending, maxlen=EXPORT_MAX_BUFFER)
+
+    async def _async_write_influxdb(self, batch: List[Sample]) -> None:
+        """POST the batch as line protocol to the configured endpoint."""
+        session = async_get_clientsession(self.hass)
+        headers = {"Content-Type": "text/plain; charset=utf-8"}
+        if self.token:
+            headers["Authorization"] = f"Token {self.token}"
+        async with session.post(
+            self.url,
+            data=to_line_protocol(self.device_id, batch),
+            headers=headers,
+            timeout=aiohttp.ClientTimeout(total=10),
+        ) as response:
+            if response.status >= 300:
+                raise aiohttp.ClientResponseError(
+                    response.request_info,
+                    response.history,
+                    status=response.status,
+                    message=await response.text(),
+                )
+
+    def _write_file(self, batch: List[Sample]) -> None:
+        """Append the batch to the day's gzip CSV file and prune old files (runs in executor)."""
+        directory = self.hass.config.path(EXPORT_DIR)
+        os.makedirs(directory, exist_ok=True)
+        prefix = f"{slugify(self.device_id)}-"
+        # 按设备+日期轮转；追加写入会生成多成员gzip，标准工具可直接读取
+        for day, samples in groupby(batch, key=lambda sample: sample[0].strftime("%Y%m%d")):
+            path = os.path.join(directory, f"{prefix}{day}.csv.gz")
+            header = not os.path.exists(path)
+            with gzip.open(path, "ab") as file:
+                file.write(to_csv(list(samples), header))
+
+        # 只保留最近retention_days天的文件（文件名中的日期可按字符串比较）
+        cutoff = (dt_util.utcnow() - timedelta(days=self.retention_days)).strftime("%Y%m%d")
+        for name in os.listdir(directory):
+            if not (name.startswith(prefix) and name.endswith(".csv.gz")):
+                continue
+            day = name[len(prefix):-len(".csv.gz")]
+            if len(day) == 8 and day.isdigit() and day < cutoff:
+                os.remove(os.path.join(directory, name))
@@ -0,0 +1,159 @@
+"""On-demand profiling for Iotrix Solar - time-boxed cProfile + coroutine timings."""
+import asyncio
+import cProfile
+import functools
+import inspect
+import io
+import logging
+import os
+import pstats
+import re
+import time
+from typing import Any, Callable, Dict, List
+
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class IotrixSolarProfiler:
+    """Process-wide profiler state shared by all config entries."""
+
+    def __init__(self):
+        self.active = False
+        # 协程名 -> [调用次数, 总墙钟时间, 最大墙钟时间]
+        self._timings: Dict[str, List[float]] = {}
+
+    def record(self, name: str, elapsed: float) -> None:
+        """Record one call (only called while profiling)."""
+        stats = self._timings.setdefault(name, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += elapsed
+        stats[2] = max(stats[2], elapsed)
+
+    def timings(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-function wall time totals (seconds)."""
+        return {
+            name: {"calls": calls, "wall_total": total, "wall_max": peak, "wall_avg": total / calls}
+            for name, (calls, total, peak) in sorted(
+                self._timings.items(), key=lambda item: item[1][1], reverse=True
+            )
+        }
+
+    def async_start(self, hass: HomeAssistant, duration: float) -> Dict[str, Any]:
+        """Start profiling for `duration` seconds; results are dumped in the background."""
+        if self.active:
+            raise HomeAssistantError("Iotrix Solar profiling is already running")
+
+        # thread_time计时器：cProfile统计的是事件循环线程上的CPU时间，
+        # 协程挂起等待网络的时间不计入；墙钟时间由profiled()单独记录。
+        # 注意cProfile会分析整个事件循环（所有组件），因此时长需要受限
+        profile = cProfile.Profile(time.thread_time)
+        try:
+            profile.enable()
+        except ValueError as e:
+            # 其他分析器（如HA自带profiler）已在运行
+            raise HomeAssistantError(f"Cannot start profiling: {str(e)}") from e
+        self._timings = {}
+        self.active = True
+
+        basename = hass.config.path(
+            f"iotrix_solar_profile_{dt_util.utcnow().strftime('%Y%m%d_%H%M%S')}"
+        )
+        hass.async_create_background_task(
+            self._async_finish(hass, profile, duration, basename),
+            "iotrix_solar_profile",
+        )
+        return {
+            "duration": duration,
+            "profile_file": f"{basename}.prof",
+            "summary_file": f"{basename}.txt",
+        }
+
+    async def _async_finish(
+        self, hass: HomeAssistant, profile: cProfile.Profile, duration: float, basename: str
+    ) -> None:
+        """Stop profiling after `duration` seconds and write the dump."""
+        try:
+            await asyncio.sleep(duration)
+        finally:
+            profile.disable()
+            self.active = False
+
+        await hass.async_add_executor_job(self._dump, profile, self.timings(), basename)
+        _LOGGER.info("Iotrix Solar profile written to %s.txt", basename)
+
+    @staticmethod
+    def _dump(profile: cProfile.Profile, timings: Dict[str, Dict[str, Any]], basename: str) -> None:
+        """Write the raw profile and a readable summary (runs in executor)."""
+        profile.dump_stats(f"{basename}.prof")
+
+        output = io.StringIO()
+        output.write("Wall time per function (seconds)\n")
+        output.write(f"{'calls':>8} {'total':>10} {'avg':>10} {'max':>10}  function\n")
+        for name, stats in timings.items():
+            output.write(
+                f"{stats['calls']:>8} {stats['wall_total']:>10.4f} {stats['wall_avg']:>10.4f} "
+                f"{stats['wall_max']:>10.4f}  {name}\n"
+            )
+        output.write("\nEvent loop CPU time, integration code only (full profile in .prof)\n")
+        stats = pstats.Stats(profile, stream=output)
+        stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(
+            re.escape(os.path.dirname(os.path.abspath(__file__)))
+        )
+        with open(f"{basename}.txt", "w", encoding="utf-8") as file:
+            file.write(output.getvalue())
+
+
+PROFILER = IotrixSolarProfiler()
+
+
+def timed_call(name: str, func: Callable, *args, **kwargs) -> Any:
+    """Call `func`, recording its wall time under `name` while profiling.
+
+    For call sites whose name is only known at runtime (e.g. per entity).
+    """
+    if not PROFILER.active:
+        return func(*args, **kwargs)
+    start = time.perf_counter()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        PROFILER.record(name, time.perf_counter() - start)
+
+
+def profiled(func: Callable) -> Callable:
+    """Record wall time of a coroutine or function while profiling is active.
+
+    When profiling is off the wrapper only checks a flag before calling the
+    original, so it can stay installed in production.
+    """
+    name = func.__qualname__.replace("<locals>.", "")
+
+    if inspect.iscoroutinefunction(func):
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            if not PROFILER.active:
+                return await func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                PROFILER.record(name, time.perf_counter() - start)
+
+        return async_wrapper
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if not PROFILER.active:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            PROFILER.record(name, time.perf_counter() - start)
+
+    return wrapper
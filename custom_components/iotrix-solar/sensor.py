@@ -4,12 +4,13 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DOMAIN, SENSOR_TYPES
 from .helpers import slugify
+from .profiler import timed_call
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -49,6 +50,14 @@ class IotrixSolarSensor(CoordinatorEntity, SensorEntity):
         else:
             self._attr_state_class = None
 
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the new state (timed per entity while profiling)."""
+        timed_call(
+            f"IotrixSolarSensor._handle_coordinator_update[{self.entity_id}]",
+            super()._handle_coordinator_update,
+        )
+
     @property
     def state(self):
         """Return the current state of the sensor."""
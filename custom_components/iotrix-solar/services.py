@@ -0,0 +1,190 @@
+"""Services for Iotrix Solar integration - on-demand refresh and profiling."""
+import asyncio
+import logging
+from typing import Any, Dict, Tuple
+
+import voluptuous as vol
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    DOMAIN,
+    SERVICE_REFRESH,
+    ATTR_ENTRY_ID,
+    ATTR_IOTRIX_DEVICE_ID,
+    REFRESH_COOLDOWN,
+    REFRESH_MAX_CONCURRENCY,
+    SERVICE_PROFILE,
+    ATTR_DURATION,
+    DEFAULT_PROFILE_DURATION,
+    PROFILE_MAX_DURATION,
+)
+from .profiler import PROFILER, profiled
+
+_LOGGER = logging.getLogger(__name__)
+
+# 不指定目标时刷新全部设备
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_IOTRIX_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+    }
+)
+
+PROFILE_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DURATION, default=DEFAULT_PROFILE_DURATION): vol.All(
+            vol.Coerce(float), vol.Range(min=1, max=PROFILE_MAX_DURATION)
+        ),
+    }
+)
+
+
+def _resolve_targets(
+    hass: HomeAssistant, call: ServiceCall
+) -> Dict[str, Tuple[Dict[str, Any], str]]:
+    """Map the service call target (entry/device list/all) to entry data.
+
+    Returns entry id -> (entry data, Iotrix device id), resolved up front so
+    the handler never touches hass.data after awaiting (entries may unload).
+    """
+    entries = hass.data.get(DOMAIN, {})
+    entry_ids = call.data.get(ATTR_ENTRY_ID)
+    device_ids = call.data.get(ATTR_IOTRIX_DEVICE_ID)
+
+    if not entry_ids and not device_ids:
+        entry_ids = list(entries)
+
+    targets = []
+    for entry_id in entry_ids or []:
+        if entry_id not in entries:
+            raise ServiceValidationError(f"Unknown Iotrix Solar entry: {entry_id}")
+        targets.append(entry_id)
+
+    by_device = {
+        entry_data["client"].device_id: entry_id
+        for entry_id, entry_data in entries.items()
+    }
+    for device_id in device_ids or []:
+        if device_id not in by_device:
+            raise ServiceValidationError(f"Unknown Iotrix Solar device: {device_id}")
+        targets.append(by_device[device_id])
+
+    # 去重并保持顺序
+    return {
+        entry_id: (entries[entry_id], entries[entry_id]["client"].device_id)
+        for entry_id in dict.fromkeys(targets)
+    }
+
+
+@profiled
+async def _async_refresh_entry(
+    hass: HomeAssistant, entry_data: Dict[str, Any], semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """Refresh one entry, merging overlapping calls into a single request.
+
+    Manual calls share one coordinator refresh; that refresh in turn joins
+    a scheduled fetch already in flight, and the coordinator notifies
+    listeners only once per fetch result (see coordinator.py).
+    """
+    coordinator = entry_data["coordinator"]
+    loop_time = hass.loop.time
+
+    task = entry_data.get("refresh_task")
+    if task is None or task.done():
+        # 冷却窗口内刚刷新成功过，直接返回当前快照
+        last_refresh = entry_data.get("last_manual_refresh")
+        if (
+            last_refresh is not None
+            and coordinator.last_update_success
+            and loop_time() - last_refresh < REFRESH_COOLDOWN
+        ):
+            return _snapshot(coordinator)
+
+        async def _refresh() -> None:
+            async with semaphore:
+                await coordinator.async_refresh()
+            entry_data["last_manual_refresh"] = loop_time()
+
+        task = hass.async_create_task(_refresh())
+        entry_data["refresh_task"] = task
+
+    # shield: 某个调用方被取消时不影响其他等待同一刷新的调用方
+    await asyncio.shield(task)
+    return _snapshot(coordinator)
+
+
+def _snapshot(coordinator) -> Dict[str, Any]:
+    """Build the service response payload for one coordinator."""
+    return {
+        "last_update_success": coordinator.last_update_success,
+        "data": dict(coordinator.data or {}),
+    }
+
+
+async def async_setup_services(hass: HomeAssistant) -> None:
+    """Register integration services (once for all config entries)."""
+    if not hass.services.has_service(DOMAIN, SERVICE_REFRESH):
+        _async_register_refresh(hass)
+    if not hass.services.has_service(DOMAIN, SERVICE_PROFILE):
+        _async_register_profile(hass)
+
+
+def _async_register_refresh(hass: HomeAssistant) -> None:
+    """Register the refresh service."""
+    semaphore = asyncio.Semaphore(REFRESH_MAX_CONCURRENCY)
+
+    async def async_handle_refresh(call: ServiceCall) -> ServiceResponse:
+        """Refresh targeted devices now and return the new snapshots."""
+        targets = _resolve_targets(hass, call)
+        results = await asyncio.gather(
+            *(
+                _async_refresh_entry(hass, entry_data, semaphore)
+                for entry_data, _device_id in targets.values()
+            )
+        )
+
+        devices = {}
+        for (entry_id, (_entry_data, device_id)), snapshot in zip(targets.items(), results):
+            devices[device_id] = {ATTR_ENTRY_ID: entry_id, **snapshot}
+            if not snapshot["last_update_success"]:
+                _LOGGER.warning("Manual refresh failed for device %s", device_id)
+        return {"devices": devices}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        async_handle_refresh,
+        schema=REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+def _async_register_profile(hass: HomeAssistant) -> None:
+    """Register the profile service."""
+
+    async def async_handle_profile(call: ServiceCall) -> ServiceResponse:
+        """Start time-boxed profiling; returns immediately with the dump paths."""
+        return PROFILER.async_start(hass, call.data[ATTR_DURATION])
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE,
+        async_handle_profile,
+        schema=PROFILE_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+async def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove integration services when the last entry is unloaded."""
+    if hass.data.get(DOMAIN):
+        return
+    hass.services.async_remove(DOMAIN, SERVICE_REFRESH)
+    hass.services.async_remove(DOMAIN, SERVICE_PROFILE)